@@ -6,7 +6,10 @@ Python's UTF-8 conversion API caches the conversion, so repeatedly using the
 same haystack would understate ahocorasick_rs's overhead.
 """
 
+import collections
+import functools
 import os
+import sys
 
 import pytest
 
@@ -15,25 +18,27 @@ import ahocorasick_rs  # our module
 
 # ~5000 popular first names, filtered down to ~4200:
 with open(os.path.join(os.path.dirname(__file__), "names.txt")) as f:
-    PATTERNS_LONG = [line.strip().lower() for line in f if len(line.strip()) > 4]
+    PATTERNS_LONG = tuple(
+        sys.intern(line.strip().lower()) for line in f if len(line.strip()) > 4
+    )
 
 
 # 90% no matches, 10% with 1 match, about 600 characters
 def make_haystacks_long():
     line = "No one who had ever seen {} in her infancy would have supposed her born to be an heroine. Her situation in life, the character of her father and mother, her own person and disposition, were all equally against her. Her father was a clergyman, without being neglected, or poor, and a very respectable man, though his name was whatevs—and he had never been handsome. He had a considerable independence besides two good livings—and he was not in the least addicted to locking up his daughters. Her mother was a woman of useful plain sense, with a good temper, and, what is more remarkable, with a good constitution {}.".lower()
-    result = []
-    for i in range(100000):
-        if i % 90 == 0:
-            name = PATTERNS_LONG[i % len(PATTERNS_LONG)]
-        else:
-            name = "notaperson"
-        result.append(line.format(name, i))
-    return result
+    prefix, middle, suffix = line.split("{}")
+    names = ["notaperson"] * 100000
+    for i in range(0, len(names), 90):
+        names[i] = PATTERNS_LONG[i % len(PATTERNS_LONG)]
+    return [
+        prefix + name + middle + index + suffix
+        for (name, index) in zip(names, map(str, range(len(names))))
+    ]
 
 
 HAYSTACKS_LONG = make_haystacks_long()
 
-PATTERNS_SHORT = [
+PATTERNS_SHORT = (
     "abc",
     "hello",
     "world",
@@ -44,12 +49,10 @@ PATTERNS_SHORT = [
     "birds",
     "host7",
     "host76",
-]
+)
 HAYSTACKS_SHORT = [
-    "arbitrarymonkey says hello to fish host76, 0.123 my friend, but why??? {}".format(
-        i
-    )
-    for i in range(10_000)
+    "arbitrarymonkey says hello to fish host76, 0.123 my friend, but why??? " + i
+    for i in map(str, range(10_000))
 ]
 
 
@@ -61,106 +64,219 @@ def make_pyahocorasick_automaton(patterns):
     return automaton
 
 
-parameterize_datasets = pytest.mark.parametrize(
-    "test_data",
-    [(PATTERNS_SHORT, HAYSTACKS_SHORT), (PATTERNS_LONG, HAYSTACKS_LONG)],
-    ids=["short", "long"],
-)
+DATASETS = {
+    "short": (PATTERNS_SHORT, HAYSTACKS_SHORT),
+    "long": (PATTERNS_LONG, HAYSTACKS_LONG),
+}
+
+
+# Building an automaton for thousands of patterns is slow, so only do it once
+# per dataset and configuration rather than once per test. The cached automata
+# stay alive for the whole session, so this trades memory for build time:
+@functools.lru_cache(maxsize=None)
+def get_pyahocorasick_automaton(dataset):
+    patterns, _ = DATASETS[dataset]
+    return make_pyahocorasick_automaton(patterns)
+
+
+def get_ahocorasick_rs(dataset, matchkind="Standard", implementation=None):
+    # lru_cache treats positional and keyword arguments as different keys, so
+    # always pass them positionally:
+    return _get_ahocorasick_rs(dataset, matchkind, implementation)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_ahocorasick_rs(dataset, matchkind, implementation):
+    patterns, _ = DATASETS[dataset]
+    if implementation is not None:
+        implementation = getattr(ahocorasick_rs.Implementation, implementation)
+    return ahocorasick_rs.AhoCorasick(
+        patterns,
+        matchkind=getattr(ahocorasick_rs.MatchKind, matchkind),
+        implementation=implementation,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_bytes_ahocorasick_rs(dataset):
+    patterns, _ = DATASETS[dataset]
+    return ahocorasick_rs.BytesAhoCorasick([p.encode("utf-8") for p in patterns])
+
+
+parameterize_datasets = pytest.mark.parametrize("dataset", list(DATASETS))
 
 
 @parameterize_datasets
-def test_pyahocorasick_overlapping(benchmark, test_data):
+def test_pyahocorasick_overlapping(benchmark, dataset):
     """pyahocorasick overlapping matches."""
-    patterns, haystacks = test_data
-    automaton = make_pyahocorasick_automaton(patterns)
+    _, haystacks = DATASETS[dataset]
+    automaton = get_pyahocorasick_automaton(dataset)
 
     def run():
         for haystack in haystacks:
             x = list(automaton.iter(haystack))
         return x
 
-    print(benchmark(run))
+    benchmark(run)
+
+
+@parameterize_datasets
+def test_pyahocorasick_overlapping_count(benchmark, dataset):
+    """
+    pyahocorasick overlapping matches, consuming the iterator without building
+    a list, to separate match throughput from list materialization.
+    """
+    _, haystacks = DATASETS[dataset]
+    automaton = get_pyahocorasick_automaton(dataset)
+
+    def run():
+        for haystack in haystacks:
+            collections.deque(automaton.iter(haystack), maxlen=0)
+
+    benchmark(run)
 
 
 @parameterize_datasets
-def test_pyahocorasick_longest_match(benchmark, test_data):
+def test_pyahocorasick_longest_match(benchmark, dataset):
     """pyahocorasick longest matches."""
-    patterns, haystacks = test_data
-    automaton = make_pyahocorasick_automaton(patterns)
+    _, haystacks = DATASETS[dataset]
+    automaton = get_pyahocorasick_automaton(dataset)
 
     def run():
         for haystack in haystacks:
             x = list(automaton.iter_long(haystack))
         return x
 
-    print(benchmark(run))
+    benchmark(run)
 
 
 @parameterize_datasets
-def test_ahocorasick_rs_standard(benchmark, test_data):
-    """ahocorasick_rs standard matching algorithm."""
-    patterns, haystacks = test_data
-    ac = ahocorasick_rs.AhoCorasick(patterns)
+@pytest.mark.parametrize(
+    "implementation", [None, "NoncontiguousNFA", "ContiguousNFA", "DFA"]
+)
+def test_ahocorasick_rs_standard(benchmark, dataset, implementation):
+    """ahocorasick_rs standard matching algorithm, for each implementation."""
+    _, haystacks = DATASETS[dataset]
+    ac = get_ahocorasick_rs(dataset, implementation=implementation)
 
     def run():
         for haystack in haystacks:
             x = ac.find_matches_as_strings(haystack)
         return x
 
-    print(benchmark(run))
+    benchmark(run)
 
 
 @parameterize_datasets
-def test_ahocorasick_rs_standard_indexes(benchmark, test_data):
+def test_ahocorasick_rs_standard_indexes(benchmark, dataset):
     """ahocorasick_rs standard matching algorithm, returning indexes."""
-    patterns, haystacks = test_data
-    ac = ahocorasick_rs.AhoCorasick(patterns)
+    _, haystacks = DATASETS[dataset]
+    ac = get_ahocorasick_rs(dataset)
 
     def run():
         for haystack in haystacks:
             x = ac.find_matches_as_indexes(haystack)
         return x
 
-    print(benchmark(run))
+    benchmark(run)
 
 
 @parameterize_datasets
-def test_ahocorasick_rs_overlapping(benchmark, test_data):
+def test_ahocorasick_rs_bytes_standard_indexes(benchmark, dataset):
+    """
+    ahocorasick_rs standard matching algorithm on pre-encoded ``bytes``
+    haystacks, returning indexes; byte offsets don't need mapping to code
+    points, which is most of the work for the non-ASCII long haystacks.
+    """
+    _, haystacks = DATASETS[dataset]
+    ac = get_bytes_ahocorasick_rs(dataset)
+    haystacks = [haystack.encode("utf-8") for haystack in haystacks]
+
+    def run():
+        for haystack in haystacks:
+            x = ac.find_matches_as_indexes(haystack)
+        return x
+
+    benchmark(run)
+
+
+@parameterize_datasets
+def test_ahocorasick_rs_overlapping(benchmark, dataset):
     """ahocorasick_rs overlapping matches."""
-    patterns, haystacks = test_data
-    ac = ahocorasick_rs.AhoCorasick(patterns)
+    _, haystacks = DATASETS[dataset]
+    ac = get_ahocorasick_rs(dataset)
 
     def run():
         for haystack in haystacks:
             x = ac.find_matches_as_strings(haystack, overlapping=True)
         return x
 
-    print(benchmark(run))
+    benchmark(run)
+
+
+@parameterize_datasets
+def test_ahocorasick_rs_overlapping_indexes(benchmark, dataset):
+    """ahocorasick_rs overlapping matches, returning indexes."""
+    _, haystacks = DATASETS[dataset]
+    ac = get_ahocorasick_rs(dataset)
+
+    def run():
+        for haystack in haystacks:
+            x = ac.find_matches_as_indexes(haystack, overlapping=True)
+        return x
+
+    benchmark(run)
 
 
 @parameterize_datasets
-def test_ahocorasick_rs_longest_match(benchmark, test_data):
+def test_ahocorasick_rs_longest_match(benchmark, dataset):
     """ahocorasick_rs longest matches."""
-    patterns, haystacks = test_data
-    ac = ahocorasick_rs.AhoCorasick(
-        patterns, matchkind=ahocorasick_rs.MatchKind.LeftmostLongest
-    )
+    _, haystacks = DATASETS[dataset]
+    ac = get_ahocorasick_rs(dataset, "LeftmostLongest")
 
     def run():
         for haystack in haystacks:
             x = ac.find_matches_as_strings(haystack)
         return x
 
-    print(benchmark(run))
+    benchmark(run)
+
+
+@parameterize_datasets
+def test_ahocorasick_rs_contains_any(benchmark, dataset):
+    """ahocorasick_rs checking whether there are any matches at all."""
+    _, haystacks = DATASETS[dataset]
+    ac = get_ahocorasick_rs(dataset)
+
+    def run():
+        for haystack in haystacks:
+            x = ac.contains_any(haystack)
+        return x
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize("input_kind", ["list", "tuple", "iter"])
+def test_ahocorasick_rs_construction(benchmark, input_kind):
+    """ahocorasick_rs construction, from different kinds of pattern iterables."""
+    # Build the list up front so only construction itself gets timed:
+    patterns = list(PATTERNS_LONG) if input_kind == "list" else PATTERNS_LONG
+
+    def run():
+        return ahocorasick_rs.AhoCorasick(
+            iter(patterns) if input_kind == "iter" else patterns
+        )
+
+    benchmark(run)
 
 
 @parameterize_datasets
-def test_overhead(benchmark, test_data):
+def test_overhead(benchmark, dataset):
     """Just run a function that does everything other than call API."""
-    _, haystacks = test_data
+    _, haystacks = DATASETS[dataset]
 
     def run():
         for haystack in haystacks:
             _ = haystack
 
-    print(benchmark(run))
+    benchmark(run)
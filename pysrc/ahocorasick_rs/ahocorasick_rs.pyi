@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Optional, Iterable
+from typing import Optional, Iterable, Iterator
 import sys
 
 if sys.version_info >= (3, 12):
@@ -29,9 +29,13 @@ class AhoCorasick:
     def find_matches_as_indexes(
         self, haystack: str, overlapping: bool = False
     ) -> list[tuple[int, int, int]]: ...
+    def find_matches_iter(
+        self, haystack: str, overlapping: bool = False
+    ) -> Iterator[tuple[int, int, int]]: ...
     def find_matches_as_strings(
         self, haystack: str, overlapping: bool = False
     ) -> list[str]: ...
+    def contains_any(self, haystack: str) -> bool: ...
 
 class BytesAhoCorasick:
     def __init__(
@@ -43,3 +47,4 @@ class BytesAhoCorasick:
     def find_matches_as_indexes(
         self, haystack: Buffer, overlapping: bool = False
     ) -> list[tuple[int, int, int]]: ...
+    def contains_any(self, haystack: Buffer) -> bool: ...
@@ -1,13 +1,15 @@
 use std::cell::Cell;
 
 use aho_corasick::{
-    AhoCorasick, AhoCorasickBuilder, AhoCorasickKind, Match, MatchError, MatchKind,
+    automaton::OverlappingState, AhoCorasick, AhoCorasickBuilder, AhoCorasickKind, Input, Match,
+    MatchError, MatchKind,
 };
-use itertools::Itertools;
+use itertools::{Either, Itertools};
 use pyo3::{
     buffer::{PyBuffer, ReadOnlyCell},
     exceptions::{PyTypeError, PyValueError},
     prelude::*,
+    pybacked::PyBackedStr,
     types::{PyBytes, PyList, PyString},
 };
 
@@ -37,39 +39,52 @@ fn match_error_to_pyerror(e: MatchError) -> PyErr {
     PyValueError::new_err(e.to_string())
 }
 
+/// Return whether a string is ASCII, without scanning it the way
+/// ``str::is_ascii()`` does: the length in code points and the UTF-8 length
+/// are only equal if every code point is a single byte.
+fn is_ascii(s: &Bound<'_, PyString>) -> PyResult<bool> {
+    Ok(s.len()? == s.to_str()?.len())
+}
+
 /// Return matches for a given haystack.
 fn get_matches<'a>(
     ac_impl: &'a AhoCorasick,
     haystack: &'a [u8],
     overlapping: bool,
 ) -> PyResult<impl Iterator<Item = Match> + 'a> {
-    let mut overlapping_it = None;
-    let mut non_overlapping_it = None;
-
-    if overlapping {
-        overlapping_it = Some(
+    // Pick the iterator once up front rather than chaining two optional
+    // iterators, so collecting doesn't go through Chain/Flatten adapters.
+    Ok(if overlapping {
+        Either::Left(
             ac_impl
                 .try_find_overlapping_iter(haystack)
                 .map_err(match_error_to_pyerror)?,
-        );
+        )
     } else {
-        non_overlapping_it = Some(
+        Either::Right(
             ac_impl
                 .try_find_iter(haystack)
                 .map_err(match_error_to_pyerror)?,
-        );
-    }
+        )
+    })
+}
 
-    Ok(overlapping_it
-        .into_iter()
-        .flatten()
-        .chain(non_overlapping_it.into_iter().flatten()))
+/// Iterate over the patterns passed to a constructor. Lists are iterated
+/// directly, which is cheaper than going through the Python iterator protocol;
+/// list subclasses might override ``__iter__()``, so they aren't.
+fn iter_patterns<'py>(
+    patterns: &Bound<'py, PyAny>,
+) -> PyResult<impl Iterator<Item = PyResult<Bound<'py, PyAny>>>> {
+    Ok(match patterns.downcast_exact::<PyList>() {
+        Ok(list) => Either::Left(list.iter().map(Ok::<_, PyErr>)),
+        Err(_) => Either::Right(patterns.iter()?),
+    })
 }
 
 impl PyAhoCorasick {
     /// Create mapping from byte index to Unicode code point (character) index
     /// in the haystack.
-    fn get_byte_to_code_point(&self, haystack: &str) -> Vec<usize> {
+    fn get_byte_to_code_point(haystack: &str) -> Vec<usize> {
         // Map UTF-8 byte index to Unicode code point index; the latter is what
         // Python users expect.
         let mut byte_to_code_point = vec![usize::MAX; haystack.len() + 1];
@@ -143,7 +158,7 @@ impl PyAhoCorasick {
         let patterns_error: Cell<Option<PyErr>> = Cell::new(None);
 
         // Convert the `patterns` iterable into an Iterator over Py<PyString>:
-        let mut patterns_iter = patterns.iter()?.map_while(|pat| {
+        let mut patterns_iter = iter_patterns(&patterns)?.map_while(|pat| {
             pat.and_then(|i| i.downcast_into::<PyString>().map_err(PyErr::from).map(|i|i.into_py(py)))
                 .map_or_else(
                     |e| {
@@ -192,7 +207,9 @@ impl PyAhoCorasick {
                         // Release the GIL in case some other thread wants to do work:
                         py.allow_threads(|| ());
 
-                        chunk.map(|s| s.extract::<String>(py).ok())
+                        // PyBackedStr points at the string's UTF-8 data
+                        // rather than copying it into a new String:
+                        chunk.map(|s| s.extract::<PyBackedStr>(py).ok())
                     })
                     .map_while(|s| {
                         s.and_then(|s| {
@@ -224,13 +241,26 @@ impl PyAhoCorasick {
     #[pyo3(signature = (haystack, overlapping = false))]
     fn find_matches_as_indexes(
         self_: PyRef<Self>,
-        haystack: &str,
+        haystack: Bound<'_, PyString>,
         overlapping: bool,
     ) -> PyResult<Vec<(u64, usize, usize)>> {
-        let byte_to_code_point = self_.get_byte_to_code_point(haystack);
         let py = self_.py();
+        let haystack_is_ascii = is_ascii(&haystack)?;
+        let haystack = haystack.to_str()?;
         let matches = get_matches(&self_.ac_impl, haystack.as_bytes(), overlapping)?;
+        if haystack_is_ascii {
+            // Byte offsets and code point offsets are the same for ASCII, so
+            // there's no need to build a mapping between them:
+            return py.allow_threads(|| {
+                Ok(matches
+                    .map(|m| (m.pattern().as_u64(), m.start(), m.end()))
+                    .collect())
+            });
+        }
         py.allow_threads(|| {
+            // Building the mapping is a full pass over the haystack, so do it
+            // without holding the GIL too:
+            let byte_to_code_point = Self::get_byte_to_code_point(haystack);
             Ok(matches
                 .map(|m| {
                     (
@@ -243,6 +273,38 @@ impl PyAhoCorasick {
         })
     }
 
+    /// Return an iterator of matches as tuple of (index_into_patterns,
+    /// start_index_in_haystack, end_index_in_haystack). Unlike
+    /// ``find_matches_as_indexes()``, matches are searched for one at a time
+    /// as the iterator is consumed, so the full list of matches is never
+    /// created. If ``overlapping`` is ``False`` (the default), don't include
+    /// overlapping results.
+    #[pyo3(signature = (haystack, overlapping = false))]
+    fn find_matches_iter(
+        self_: Bound<'_, Self>,
+        haystack: Bound<'_, PyString>,
+        overlapping: bool,
+    ) -> PyResult<PyMatchesIterator> {
+        let match_kind = self_.borrow().ac_impl.match_kind();
+        if overlapping && match_kind != MatchKind::Standard {
+            // Report this now, rather than on the first call to __next__():
+            return Err(match_error_to_pyerror(MatchError::unsupported_overlapping(
+                match_kind,
+            )));
+        }
+        Ok(PyMatchesIterator {
+            ac: self_.unbind(),
+            haystack_is_ascii: is_ascii(&haystack)?,
+            haystack: haystack.unbind(),
+            overlapping,
+            position: 0,
+            overlapping_state: OverlappingState::start(),
+            bytes_counted: 0,
+            code_points_counted: 0,
+            done: false,
+        })
+    }
+
     /// Return matches as list of patterns (i.e. strings). If ``overlapping`` is
     /// ``False`` (the default), don't include overlapping results.
     #[pyo3(signature = (haystack, overlapping = false))]
@@ -264,6 +326,98 @@ impl PyAhoCorasick {
         };
         Ok(result.into())
     }
+
+    /// Return whether any of the patterns match the haystack. This stops
+    /// searching at the first match, so it's cheaper than checking whether
+    /// ``find_matches_as_indexes()`` returned an empty list.
+    fn contains_any(self_: PyRef<Self>, haystack: &str) -> PyResult<bool> {
+        let py = self_.py();
+        let ac_impl = &self_.ac_impl;
+        py.allow_threads(|| {
+            ac_impl
+                .try_find(Input::new(haystack).earliest(true))
+                .map(|m| m.is_some())
+                .map_err(match_error_to_pyerror)
+        })
+    }
+}
+
+/// Iterator of matches, returned by ``AhoCorasick.find_matches_iter()``.
+#[pyclass(name = "MatchesIterator")]
+struct PyMatchesIterator {
+    ac: Py<PyAhoCorasick>,
+    haystack: Py<PyString>,
+    /// If true, byte offsets are already code point offsets.
+    haystack_is_ascii: bool,
+    overlapping: bool,
+    /// Where the next non-overlapping search starts.
+    position: usize,
+    /// Where the next overlapping search resumes.
+    overlapping_state: OverlappingState,
+    /// How far into the haystack code points have been counted, in bytes and
+    /// in code points respectively.
+    bytes_counted: usize,
+    code_points_counted: usize,
+    /// Set once a search finds nothing, so later calls don't search again.
+    done: bool,
+}
+
+/// Methods for PyMatchesIterator.
+#[pymethods]
+impl PyMatchesIterator {
+    fn __iter__(self_: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        self_
+    }
+
+    fn __next__(mut self_: PyRefMut<'_, Self>) -> PyResult<Option<(u64, usize, usize)>> {
+        if self_.done {
+            return Ok(None);
+        }
+        let py = self_.py();
+        let this = &mut *self_;
+        let ac = this.ac.borrow(py);
+        let ac_impl = &ac.ac_impl;
+        let overlapping = this.overlapping;
+        let haystack_is_ascii = this.haystack_is_ascii;
+        let position = &mut this.position;
+        let state = &mut this.overlapping_state;
+        let bytes_counted = &mut this.bytes_counted;
+        let code_points_counted = &mut this.code_points_counted;
+        // The str is immutable, so it's fine to search it without the GIL:
+        let haystack = this.haystack.bind(py).to_str()?;
+        let found = py
+            .allow_threads(|| -> Result<_, MatchError> {
+                let found = if overlapping {
+                    ac_impl.try_find_overlapping(haystack, state)?;
+                    state.get_match()
+                } else {
+                    ac_impl.try_find(Input::new(haystack).span(*position..haystack.len()))?
+                };
+                let Some(m) = found else {
+                    return Ok(None);
+                };
+                if !overlapping {
+                    // Patterns can't be empty, so this always makes progress.
+                    *position = m.end();
+                }
+                if haystack_is_ascii {
+                    return Ok(Some((m.pattern().as_u64(), m.start(), m.end())));
+                }
+                // Match ends never decrease, even when overlapping, so only
+                // the code points since the previous match's end need
+                // counting:
+                let end = *code_points_counted + haystack[*bytes_counted..m.end()].chars().count();
+                let start = end - haystack[m.start()..m.end()].chars().count();
+                *bytes_counted = m.end();
+                *code_points_counted = end;
+                Ok(Some((m.pattern().as_u64(), start, end)))
+            })
+            .map_err(match_error_to_pyerror)?;
+        if found.is_none() {
+            this.done = true;
+        }
+        Ok(found)
+    }
 }
 
 /// A wrapper around PyBuffer that can be passed directly to AhoCorasickBuilder.
@@ -364,25 +518,24 @@ impl PyBytesAhoCorasick {
         let patterns_error: Cell<Option<PyErr>> = Cell::new(None);
 
         // Convert the `patterns` iterable into an Iterator over PyBufferBytes
-        let patterns_iter =
-            patterns
-                .iter()?
-                .map_while(|pat| match pat.and_then(PyBufferBytes::try_from) {
-                    Ok(pat) => {
-                        if pat.as_ref().is_empty() {
-                            patterns_error.set(Some(PyValueError::new_err(
-                                "You passed in an empty pattern",
-                            )));
-                            None
-                        } else {
-                            Some(pat)
-                        }
-                    }
-                    Err(e) => {
-                        patterns_error.set(Some(e));
+        let patterns_iter = iter_patterns(&patterns)?.map_while(|pat| {
+            match pat.and_then(PyBufferBytes::try_from) {
+                Ok(pat) => {
+                    if pat.as_ref().is_empty() {
+                        patterns_error.set(Some(PyValueError::new_err(
+                            "You passed in an empty pattern",
+                        )));
                         None
+                    } else {
+                        Some(pat)
                     }
-                });
+                }
+                Err(e) => {
+                    patterns_error.set(Some(e));
+                    None
+                }
+            }
+        });
 
         let ac_impl = AhoCorasickBuilder::new()
             .kind(implementation.map(|i| i.into()))
@@ -426,6 +579,30 @@ impl PyBytesAhoCorasick {
             py.allow_threads(|| Ok(matches.collect()))
         }
     }
+
+    /// Return whether any of the patterns match the haystack. This stops
+    /// searching at the first match, so it's cheaper than checking whether
+    /// ``find_matches_as_indexes()`` returned an empty list.
+    fn contains_any(self_: PyRef<Self>, haystack: Bound<'_, PyAny>) -> PyResult<bool> {
+        let is_bytes = haystack.is_instance_of::<PyBytes>();
+        let py = haystack.py();
+        let haystack_buffer = PyBufferBytes::try_from(haystack)?;
+        let input = Input::new(haystack_buffer.as_ref()).earliest(true);
+        let ac_impl = &self_.ac_impl;
+        let is_match = || {
+            ac_impl
+                .try_find(input)
+                .map(|m| m.is_some())
+                .map_err(match_error_to_pyerror)
+        };
+
+        if !is_bytes {
+            // Same safety caveat as find_matches_as_indexes(): keep the GIL.
+            is_match()
+        } else {
+            py.allow_threads(is_match)
+        }
+    }
 }
 
 /// The main Python module.
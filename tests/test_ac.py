@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import gc
+from typing import Iterator, List, Optional
 
 import pytest
 
@@ -72,6 +73,21 @@ def test_iterator_of_patterns(store_patterns: Optional[bool]) -> None:
     assert ac.find_matches_as_strings(haystack) == expected
 
 
+@pytest.mark.parametrize("store_patterns", [True, False, None])
+def test_list_subclass_of_patterns(store_patterns: Optional[bool]) -> None:
+    """
+    A ``list`` subclass's ``__iter__()`` is used to get the patterns.
+    """
+
+    class Patterns(List[str]):
+        def __iter__(self) -> Iterator[str]:
+            return iter(["hello", "world"])
+
+    haystack = "hello, world, fish"
+    ac = AhoCorasick(Patterns(["fish"]), store_patterns=store_patterns)
+    assert ac.find_matches_as_strings(haystack) == ["hello", "world"]
+
+
 def test_bad_iterators() -> None:
     """
     When constructed with a bad iterator, the underlying Python error is raised.
@@ -290,3 +306,117 @@ def test_overlapping() -> None:
     # Other matchkinds don't support overlapping.
     assert_no_overlapping(AhoCorasick(patterns, matchkind=MatchKind.LeftmostFirst))
     assert_no_overlapping(AhoCorasick(patterns, matchkind=MatchKind.LeftmostLongest))
+
+
+@pytest.mark.parametrize(
+    "matchkind",
+    [MatchKind.Standard, MatchKind.LeftmostFirst, MatchKind.LeftmostLongest],
+)
+def test_contains_any(matchkind: MatchKind) -> None:
+    """
+    contains_any() returns whether any pattern matches the haystack.
+    """
+    ac = AhoCorasick(["hello", "world"], matchkind=matchkind)
+    assert ac.contains_any("hello, world")
+    assert ac.contains_any("oh, hello")
+    assert not ac.contains_any("goodbye")
+    assert not ac.contains_any("")
+
+
+@given(st.text(min_size=1), st.text())
+def test_contains_any_totally_random(pattern: str, haystack: str) -> None:
+    """
+    contains_any() agrees with find_matches_as_indexes().
+    """
+    ac = AhoCorasick([pattern])
+    assert ac.contains_any(haystack) == bool(ac.find_matches_as_indexes(haystack))
+
+
+# Overlapping is only supported by MatchKind.Standard:
+ITER_MATCHKINDS = [
+    (MatchKind.Standard, False),
+    (MatchKind.Standard, True),
+    (MatchKind.LeftmostFirst, False),
+    (MatchKind.LeftmostLongest, False),
+]
+
+
+@pytest.mark.parametrize(
+    "haystack,patterns",
+    [
+        ("hello, world, hello again", ["hello", "world"]),
+        ("hello, world ☃fishá l🤦l", ["d ☃f", "há", "l🤦l"]),
+        ("há l🤦l há l🤦lo", ["l🤦", "há l🤦l", "🤦lo", "á"]),
+        ("no matches", ["hello"]),
+        ("", ["hello"]),
+    ],
+)
+@pytest.mark.parametrize("matchkind,overlapping", ITER_MATCHKINDS)
+def test_find_matches_iter(
+    haystack: str, patterns: list[str], matchkind: MatchKind, overlapping: bool
+) -> None:
+    """
+    find_matches_iter() yields the same matches as find_matches_as_indexes().
+    """
+    ac = AhoCorasick(patterns, matchkind=matchkind)
+    matches = ac.find_matches_iter(haystack, overlapping=overlapping)
+    assert iter(matches) is matches
+    assert list(matches) == ac.find_matches_as_indexes(
+        haystack, overlapping=overlapping
+    )
+    assert list(matches) == []
+
+
+def test_find_matches_iter_outlives_automaton() -> None:
+    """
+    The iterator returned by find_matches_iter() keeps working after the
+    ``AhoCorasick`` it came from is deleted.
+    """
+    ac = AhoCorasick(["hello", "🤦"])
+    matches = ac.find_matches_iter("🤦 hello, hello")
+    assert next(matches) == (1, 0, 1)
+    del ac
+    gc.collect()
+    assert list(matches) == [(0, 2, 7), (0, 9, 14)]
+
+
+def test_find_matches_iter_overlapping_matchkind() -> None:
+    """
+    find_matches_iter() only supports overlapping with MatchKind.Standard, and
+    complains immediately otherwise.
+    """
+    haystack = "This is the winter of my discontent"
+    patterns = ["content", "disco", "disc", "discontent", "winter"]
+    expected = ["winter", "disc", "disco", "discontent", "content"]
+    matches = AhoCorasick(patterns).find_matches_iter(haystack, overlapping=True)
+    assert [patterns[i] for (i, _, _) in matches] == expected
+
+    for matchkind in [MatchKind.LeftmostFirst, MatchKind.LeftmostLongest]:
+        with pytest.raises(ValueError):
+            AhoCorasick(patterns, matchkind=matchkind).find_matches_iter(
+                haystack, overlapping=True
+            )
+
+
+@given(
+    st.text(),
+    st.lists(st.text(min_size=1), min_size=1),
+    st.text(),
+    st.sampled_from(ITER_MATCHKINDS),
+)
+def test_find_matches_iter_extensive(
+    prefix: str,
+    patterns: list[str],
+    suffix: str,
+    matchkind_overlapping: tuple[MatchKind, bool],
+) -> None:
+    """
+    find_matches_iter() matches find_matches_as_indexes(), with
+    property-testing.
+    """
+    matchkind, overlapping = matchkind_overlapping
+    haystack = prefix + "".join(patterns) + suffix
+    ac = AhoCorasick(patterns, matchkind=matchkind)
+    matches = ac.find_matches_iter(haystack, overlapping=overlapping)
+    expected = ac.find_matches_as_indexes(haystack, overlapping=overlapping)
+    assert list(matches) == expected
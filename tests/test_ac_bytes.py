@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Iterator, List, Optional
 
 import pytest
 
@@ -115,6 +115,20 @@ def test_iterator_of_patterns() -> None:
     assert [haystack[s:e] for (_, s, e) in index_matches] == expected
 
 
+def test_list_subclass_of_patterns() -> None:
+    """
+    A ``list`` subclass's ``__iter__()`` is used to get the patterns.
+    """
+
+    class Patterns(List[bytes]):
+        def __iter__(self) -> Iterator[bytes]:
+            return iter([b"hello", b"world"])
+
+    haystack = b"hello, world, fish"
+    ac = BytesAhoCorasick(Patterns([b"fish"]))
+    assert [s for (_, s, _) in ac.find_matches_as_indexes(haystack)] == [0, 7]
+
+
 def test_bad_iterators() -> None:
     """
     When constructed with a bad iterator, the underlying Python error is raised.
@@ -293,3 +307,15 @@ def test_overlapping() -> None:
     assert_no_overlapping(
         BytesAhoCorasick(patterns, matchkind=MatchKind.LeftmostLongest)
     )
+
+
+@pytest.mark.parametrize("haystack_type", [bytes, bytearray, memoryview])
+def test_contains_any(haystack_type: type[bytes | bytearray | memoryview]) -> None:
+    """
+    contains_any() returns whether any pattern matches the haystack.
+    """
+    ac = BytesAhoCorasick([b"hello", b"world"])
+    assert ac.contains_any(haystack_type(b"hello, world"))
+    assert ac.contains_any(haystack_type(b"oh, hello"))
+    assert not ac.contains_any(haystack_type(b"goodbye"))
+    assert not ac.contains_any(haystack_type(b""))